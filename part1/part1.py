@@ -2,6 +2,16 @@ import requests
 import csv
 import re
 
+try:
+    import ijson  # Streaming JSON parser, uses the yajl2_c backend when available
+    JSON_ERRORS = (ijson.JSONError,)
+except ImportError:
+    ijson = None
+    JSON_ERRORS = ()
+
+# Fields of each doc used by get_publish_year, has_desired_format and write_to_csv
+DOC_FIELDS = ('title', 'author_name', 'publisher', 'language', 'first_publish_year', 'publish_date', 'format')
+
 def get_publish_year(book):
     """
     Extracts the earliest publish year from a book record
@@ -42,6 +52,48 @@ def has_desired_format(book):
                 return True
     return False
 
+def trim_doc(doc):
+    """
+    Keeps only the fields of a book record that are used when writing the CSV
+
+    Args:
+    doc (dict): The full book record
+
+    Returns:
+    dict: The book record with only the fields in DOC_FIELDS
+    """
+    return {field: doc[field] for field in DOC_FIELDS if field in doc}
+
+class ChunkReader:
+    """
+    Minimal file-like wrapper over chunks of a response body, so ijson can read
+    it with its C reader while requests still wraps network errors
+    """
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+
+    def read(self, size=-1):
+        if size == 0:
+            return b''  # ijson probes with read(0) to tell bytes from str
+        return next(self.chunks, b'')
+
+def iter_docs(chunks):
+    """
+    Incrementally parses the docs of a search response as its chunks arrive,
+    without building the rest of the response
+
+    Args:
+    chunks (iterable of bytes): The response body in chunks
+
+    Yields:
+    dict: Each book record trimmed to DOC_FIELDS
+
+    Raises:
+    ijson.JSONError: If the body is not valid JSON
+    """
+    for doc in ijson.items(ChunkReader(chunks), 'docs.item', use_float=True):  # Floats match response.json()
+        yield trim_doc(doc)
+
 def fetch_data(base_url, params):
     """
     Fetches data from an API
@@ -61,6 +113,59 @@ def fetch_data(base_url, params):
         print(f"An error occurred: {e}")
         return {}
 
+def fetch_docs(base_url, params, handle_doc):
+    """
+    Fetches a page of search results from an API, passing each book record to
+    handle_doc while the response is being read instead of collecting them
+
+    Args:
+    base_url (str): The base URL of the API
+    params (dict): The query parameters for the API request
+    handle_doc (callable): Called with each trimmed book record
+
+    Returns:
+    int or None: The number of book records or None if an error occurred
+    """
+    try:
+        with requests.get(base_url, params=params, timeout=10, stream=True) as response:
+            response.raise_for_status()  # Raise an HTTPError for bad response
+            if ijson is None:
+                docs = [trim_doc(doc) for doc in response.json().get('docs', [])]
+            else:
+                # iter_content wraps dropped connections and read timeouts in RequestException
+                docs = iter_docs(response.iter_content(chunk_size=65536))
+            count = 0
+            for doc in docs:
+                handle_doc(doc)
+                count += 1
+            return count
+    except requests.exceptions.RequestException as e:
+        print(f"An error occurred: {e}")
+        return None
+    except JSON_ERRORS as e:
+        print(f"An error occurred while decoding the response: {e}")
+        return None
+
+def write_book(writer, book):
+    """
+    Writes a book to the CSV if it matches the search criteria
+
+    Args:
+    writer (csv.writer): The CSV writer
+    book (dict): The book record
+    """
+    # Using .get() to avoid KeyErrors
+    title = book.get('title', '')
+    author_name = ', '.join(book.get('author_name', []))
+    publisher = ', '.join(book.get('publisher', ['N/A']))
+    language = ', '.join(book.get('language', ['N/A']))
+    publish_year = get_publish_year(book)
+
+    # Include only books with "lord of the rings" in the title and an author
+    # and ensure the book has the desired format (paperback, hardcover, etc.)
+    if "lord of the rings" in title.lower() and author_name and has_desired_format(book):
+        writer.writerow([title, author_name, publish_year, publisher, language])
+
 def write_to_csv(csv_file, base_url, params, num_found):
     """
     Writes book data to a CSV file
@@ -80,25 +185,16 @@ def write_to_csv(csv_file, base_url, params, num_found):
 
             for page in range(1, total_pages + 1):
                 params['page'] = page
-                data = fetch_data(base_url, params)
+                page_start = file.tell()
+                count = fetch_docs(base_url, params, lambda book: write_book(writer, book))
 
-                if not data:
+                if count is None:
+                    # Drop any rows written before the page failed
+                    file.seek(page_start)
+                    file.truncate()
                     print(f"Failed to fetch data for page {page}")
                     continue
 
-                for book in data.get('docs', []):
-                    # Using .get() to avoid KeyErrors
-                    title = book.get('title', '')
-                    author_name = ', '.join(book.get('author_name', []))
-                    publisher = ', '.join(book.get('publisher', ['N/A']))
-                    language = ', '.join(book.get('language', ['N/A']))
-                    publish_year = get_publish_year(book)
-
-                    # Include only books with "lord of the rings" in the title and an author
-                    # and ensure the book has the desired format (paperback, hardcover, etc.)
-                    if "lord of the rings" in title.lower() and author_name and has_desired_format(book):
-                        writer.writerow([title, author_name, publish_year, publisher, language])
-
         print(f"Data has been written to {csv_file}")
 
     except IOError as e:
@@ -0,0 +1,58 @@
+import csv
+import json
+
+import pytest
+
+import part1
+
+ijson = pytest.importorskip('ijson')
+
+# A search page with nulls, floats, booleans, nested values and unused fields
+PAGE = {
+    'numFound': 2,
+    'numFoundExact': True,
+    'docs': [
+        {
+            'title': 'The Lord of the Rings',
+            'author_name': ['J.R.R. Tolkien', None],
+            'first_publish_year': 1954.5,
+            'publish_date': ['1954', 'May 1960'],
+            'format': ['Paperback'],
+            'publisher': [{'name': 'Allen & Unwin'}],
+            'subject': ['Fantasy', {'nested': [1, True]}],
+            'ia': ['lordofrings00tolk'],
+            'has_fulltext': False,
+        },
+        {'title': None, 'language': [], 'ratings': {'average': 4.5}},
+        {},
+    ],
+}
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+@pytest.mark.parametrize('size', [1, 7, 1 << 16])
+def test_iter_docs_matches_fallback(size):
+    body = json.dumps(PAGE).encode()
+    expected = [part1.trim_doc(doc) for doc in json.loads(body)['docs']]
+    assert list(part1.iter_docs(chunked(body, size))) == expected
+
+def test_iter_docs_truncated_body():
+    with pytest.raises(ijson.JSONError):
+        list(part1.iter_docs([b'{"numFound": 3, "docs": [{"title": "x"']))
+
+def test_write_to_csv_drops_rows_of_failed_page(tmp_path, monkeypatch):
+    def fake_fetch_docs(base_url, params, handle_doc):
+        if params['page'] == 2:
+            handle_doc({'title': 'Lord of the Rings (partial page)', 'author_name': ['Tolkien'], 'format': ['Hardcover']})
+            return None  # Page 2 fails after writing a row
+        handle_doc({'title': f"Lord of the Rings {params['page']}", 'author_name': ['Tolkien'], 'format': ['Hardcover']})
+        return 1
+
+    monkeypatch.setattr(part1, 'fetch_docs', fake_fetch_docs)
+    csv_file = tmp_path / 'books.csv'
+    part1.write_to_csv(str(csv_file), 'url', {'page': 1}, 250)
+
+    with open(csv_file, newline='', encoding='utf-8') as file:
+        titles = [row[0] for row in csv.reader(file)][1:]
+    assert titles == ['Lord of the Rings 1', 'Lord of the Rings 3']
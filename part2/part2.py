@@ -1,24 +1,105 @@
 import requests
 import csv
 
-def fetch_data(base_url, params):
+try:
+    import ijson  # Streaming JSON parser, uses the yajl2_c backend when available
+    JSON_ERRORS = (ijson.JSONError,)
+except ImportError:
+    ijson = None
+    JSON_ERRORS = ()
+
+# Fields of each work used by write_to_csv
+WORK_FIELDS = ('title', 'authors', 'first_publish_year', 'subject')
+
+def trim_work(work):
+    """
+    Keeps only the fields of a work that are used when writing the CSV
+
+    Args:
+    work (dict): The full work record
+
+    Returns:
+    dict: The work with only the fields in WORK_FIELDS
+    """
+    return {field: work[field] for field in WORK_FIELDS if field in work}
+
+class ChunkReader:
+    """
+    Minimal file-like wrapper over chunks of a response body, so ijson can read
+    it with its C reader while requests still wraps network errors
+    """
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+
+    def read(self, size=-1):
+        if size == 0:
+            return b''  # ijson probes with read(0) to tell bytes from str
+        return next(self.chunks, b'')
+
+def iter_works(chunks):
     """
-    Fetch data from the Open Library API
+    Incrementally parses the works of a subjects response as its chunks arrive,
+    without building the rest of the response
+
+    Args:
+    chunks (iterable of bytes): The response body in chunks
+
+    Yields:
+    dict: Each work trimmed to WORK_FIELDS
+
+    Raises:
+    ijson.JSONError: If the body is not valid JSON
+    """
+    for work in ijson.items(ChunkReader(chunks), 'works.item', use_float=True):  # Floats match response.json()
+        yield trim_work(work)
+
+def fetch_works(base_url, params, handle_work):
+    """
+    Fetch a page of works from the Open Library API, passing each work to
+    handle_work while the response is being read instead of collecting them
     
     Args:
     base_url (str): The base URL of the API
     params (dict): The query parameters for the API request
+    handle_work (callable): Called with each trimmed work
     
     Returns:
-    dict or None: The JSON response if successful, None otherwise
+    int or None: The number of works if successful, None otherwise
     """
     try:
-        response = requests.get(base_url, params=params, timeout=10)
-        response.raise_for_status()  # Raise an HTTPError for bad response
-        return response.json()
+        with requests.get(base_url, params=params, timeout=10, stream=True) as response:
+            response.raise_for_status()  # Raise an HTTPError for bad response
+            if ijson is None:
+                works = [trim_work(work) for work in response.json().get('works', [])]
+            else:
+                # iter_content wraps dropped connections and read timeouts in RequestException
+                works = iter_works(response.iter_content(chunk_size=65536))
+            count = 0
+            for work in works:
+                handle_work(work)
+                count += 1
+            return count
     except requests.exceptions.RequestException as e:
         print(f"An error occurred: {e}")
-        return {}
+        return None
+    except JSON_ERRORS as e:
+        print(f"An error occurred while decoding the response: {e}")
+        return None
+
+def write_work(writer, work):
+    """
+    Writes a work to the CSV
+
+    Args:
+    writer (csv.writer): The CSV writer
+    work (dict): The work record
+    """
+    # Using .get() to avoid KeyErrors
+    title = work.get('title', '')
+    authors = ', '.join([author.get('name', '') for author in work.get('authors', [])])
+    first_publish_year = work.get('first_publish_year', '')
+    subjects = ', '.join(work.get('subject', []))
+    writer.writerow([title, authors, first_publish_year, subjects])
 
 def write_to_csv(csv_file, base_url, params, limit):
     """
@@ -37,23 +118,18 @@ def write_to_csv(csv_file, base_url, params, limit):
 
             while True:
                 print(f"Fetching data with offset: {params['offset']}")
-                data = fetch_data(base_url, params)
+                page_start = file.tell()
+                count = fetch_works(base_url, params, lambda work: write_work(writer, work))
 
-                if not data:
+                if count is None:
+                    # Drop any rows written before the page failed so the retry doesn't duplicate them
+                    file.seek(page_start)
+                    file.truncate()
                     print(f"Failed to fetch data")
                     continue
 
-                for work in data['works']:
-                    # Using .get() to avoid KeyErrors
-                    title = work.get('title', '')
-                    authors = ', '.join([author.get('name', '') for author in work.get('authors', [])])
-                    first_publish_year = work.get('first_publish_year', '')
-                    subjects = ', '.join(work.get('subject', []))
-                    writer.writerow([title, authors, first_publish_year, subjects])
-
-                total_works = data.get('work_count', 0)
-                if params['offset'] + limit >= total_works:
-                    break  # Exit loop if we've fetched all works
+                if count < limit:
+                    break  # Exit loop on a short page, as we've fetched all works
 
                 params['offset'] += limit  # Increase offset for next batch
 
@@ -0,0 +1,62 @@
+import csv
+import json
+
+import pytest
+
+import part2
+
+ijson = pytest.importorskip('ijson')
+
+# A subjects page with nulls, floats, booleans, nested values and unused fields
+PAGE = {
+    'name': 'artificial intelligence',
+    'work_count': 2,
+    'works': [
+        {
+            'title': 'Artificial Intelligence',
+            'authors': [{'name': 'Stuart Russell', 'key': '/authors/OL1A'}, {'key': '/authors/OL2A'}],
+            'first_publish_year': 1994.5,
+            'subject': ['Artificial intelligence', None],
+            'cover_id': 1,
+            'availability': {'is_readable': True, 'isbn': None},
+        },
+        {'title': None, 'first_publish_year': None, 'has_fulltext': False},
+        {},
+    ],
+}
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+@pytest.mark.parametrize('size', [1, 7, 1 << 16])
+def test_iter_works_matches_fallback(size):
+    body = json.dumps(PAGE).encode()
+    expected = [part2.trim_work(work) for work in json.loads(body)['works']]
+    assert list(part2.iter_works(chunked(body, size))) == expected
+
+def test_iter_works_truncated_body():
+    with pytest.raises(ijson.JSONError):
+        list(part2.iter_works([b'{"work_count": 3, "works": [{"title": "x"']))
+
+def test_write_to_csv_retries_failed_page_without_duplicates(tmp_path, monkeypatch):
+    attempts = []
+
+    def fake_fetch_works(base_url, params, handle_work):
+        offset = params['offset']
+        attempts.append(offset)
+        if offset == 2 and attempts.count(offset) == 1:
+            handle_work({'title': 'work 2 (partial page)'})
+            return None  # First attempt at offset 2 fails after writing a row
+        count = 2 if offset == 0 else 1
+        for i in range(count):
+            handle_work({'title': f'work {offset + i}'})
+        return count
+
+    monkeypatch.setattr(part2, 'fetch_works', fake_fetch_works)
+    csv_file = tmp_path / 'works.csv'
+    part2.write_to_csv(str(csv_file), 'url', {'limit': 2, 'offset': 0}, 2)
+
+    with open(csv_file, newline='', encoding='utf-8') as file:
+        titles = [row[0] for row in csv.reader(file)][1:]
+    assert attempts == [0, 2, 2]
+    assert titles == ['work 0', 'work 1', 'work 2']